@@ -1,40 +1,83 @@
 # Imports and environment setup
+import asyncio
+import aiohttp
+from aiolimiter import AsyncLimiter
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from functools import lru_cache
-import time
 from collections import defaultdict
-import json
-from typing import Any
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import numpy as np
 import os
+import tempfile
+from pathlib import Path
 
 # Environment variables and API base URLs
 API_KEY = os.environ["API_KEY"]
 BASE = "https://americas.api.riotgames.com"
 
+# Transient failures are retried with exponential backoff
+MAX_RETRIES = 5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Shared HTTP session so connections to each host are kept alive and reused
+SESSION = requests.Session()
+# API key goes in a header so it never appears in URLs or error messages
+SESSION.headers["X-Riot-Token"] = API_KEY
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            backoff_factor=1.0,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+        ),
+    ),
+)
+
+# Maximum number of match data requests in flight at once
+MAX_CONCURRENT_REQUESTS = 10
+
+# Riot API rate limits (20 requests per second, 100 requests per 2 minutes),
+# applied to the concurrent match fetch only
+RATE_LIMIT_PER_SECOND = AsyncLimiter(max_rate=20, time_period=1)
+RATE_LIMIT_PER_TWO_MINUTES = AsyncLimiter(max_rate=100, time_period=120)
+
+# Local cache for match data, which never changes once a game has ended
+CACHE_DIR = Path("cache")
+
 
 # Fetch latest patch version
-@lru_cache
-def get_latest_patch(patch: str) -> str:
+@lru_cache(maxsize=1)
+def get_latest_patch() -> str:
     url = "https://ddragon.leagueoflegends.com/api/versions.json"
-    res = requests.get(url)
-    assert res.status_code == 200, f"Request failed with status code {res.status_code}"
-    latest_patch = res.json()[0]
+    res = SESSION.get(url)
+    res.raise_for_status()
+    latest_patch = orjson.loads(res.content)[0]
     return latest_patch
 
 
 # Retrieve and champion data
-@lru_cache
-def get_champion_data(patch: str) -> dict:
+@lru_cache(maxsize=1)
+def get_champion_data() -> dict:
+    patch = get_latest_patch()
     url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/champion.json"
-    res = requests.get(url)
-    assert res.status_code == 200, f"Request failed with status code {res.status_code}"
-    data = res.json()["data"]
+    res = SESSION.get(url)
+    res.raise_for_status()
+    data = orjson.loads(res.content)["data"]
     champion_data = {}
     for key in data:
         champion_id = int(data[key]["key"])
         champion_name = data[key]["name"]
-        champion_image_url = f"https://ddragon.leagueoflegends.com/cdn/15.11.1/img/champion/{data[key]['id']}.png"
+        champion_image_url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/img/champion/{data[key]['id']}.png"
         champion_data[champion_id] = {
             "name": champion_name,
             "image_url": champion_image_url,
@@ -44,45 +87,38 @@ def get_champion_data(patch: str) -> dict:
 
 
 # Lookup functions for champion name
-def get_champion_name(champion_id: int, patch: str) -> str:
-    latest_patch = get_latest_patch(patch)
-    champion_data = get_champion_data(latest_patch)
-    return (
-        "" if champion_id not in champion_data else champion_data[champion_id]["name"]
-    )
+def get_champion_name(champion_id: int) -> str:
+    return get_champion_data().get(champion_id, {}).get("name", "")
 
 
 # Fetch PUUID from name and tag
 def get_puuid(name: str, tag: str) -> str:
-    url = f"{BASE}/riot/account/v1/accounts/by-riot-id/{name}/{tag}?api_key={API_KEY}"
-    res = requests.get(url)
-    time.sleep(1)
-    assert res.status_code == 200, f"Request failed with status code {res.status_code}"
-    puuid = res.json()["puuid"]
+    url = f"{BASE}/riot/account/v1/accounts/by-riot-id/{name}/{tag}"
+    res = SESSION.get(url)
+    res.raise_for_status()
+    puuid = orjson.loads(res.content)["puuid"]
     return puuid
 
 
 # Fetch summoner name from PUUID
 def get_summoner_name(puuid: str) -> str:
-    url = f"{BASE}/riot/account/v1/accounts/by-puuid/{puuid}?api_key={API_KEY}"
-    res = requests.get(url)
-    time.sleep(1)
-    assert res.status_code == 200, f"Request failed with status code {res.status_code}"
-    name = res.json()["gameName"]
-    tag = res.json()["tagLine"]
-    summoner_name = f"{name}#{tag}"
+    url = f"{BASE}/riot/account/v1/accounts/by-puuid/{puuid}"
+    res = SESSION.get(url)
+    res.raise_for_status()
+    data = orjson.loads(res.content)
+    summoner_name = f"{data['gameName']}#{data['tagLine']}"
     return summoner_name
 
 
 # Fetch summoner rank from PUUID
 def get_summoner_rank(puuid: str) -> str:
-    url = f"https://na1.api.riotgames.com/lol/league/v4/entries/by-puuid/{puuid}?api_key={API_KEY}"
-    res = requests.get(url)
-    time.sleep(1)
-    assert res.status_code == 200, f"Request failed with status code {res.status_code}"
-    if len(res.json()) == 0:
+    url = f"https://na1.api.riotgames.com/lol/league/v4/entries/by-puuid/{puuid}"
+    res = SESSION.get(url)
+    res.raise_for_status()
+    entries = orjson.loads(res.content)
+    if len(entries) == 0:
         return ""
-    data = res.json()[0]
+    data = entries[0]
     rank = f"{data['tier']} {data['rank']}"
     return rank
 
@@ -92,168 +128,225 @@ def get_match_ids(puuid: str) -> list[str]:
     match_ids = []
     one_year_ago = int((datetime.now() - timedelta(days=365)).timestamp())
 
-    url = f"{BASE}/lol/match/v5/matches/by-puuid/{puuid}/ids?startTime={one_year_ago}&type=ranked&start=0&count=100&api_key={API_KEY}"
-    res = requests.get(url)
-    time.sleep(1)
-    assert res.status_code == 200, f"Request failed with status code {res.status_code}"
-    last_batch = res.json()
-
-    if last_batch:
-        match_ids += last_batch
-        last_match_start_time = (
-            get_match_data(match_id=last_batch[-1])["info"]["gameStartTimestamp"]
-            // 1000
-        )
+    # Page through results 100 at a time until an empty batch is returned
+    start = 0
+    while True:
+        url = f"{BASE}/lol/match/v5/matches/by-puuid/{puuid}/ids?startTime={one_year_ago}&type=ranked&start={start}&count=100"
+        res = SESSION.get(url)
+        res.raise_for_status()
+        batch = orjson.loads(res.content)
+        if not batch:
+            break
 
-        while last_match_start_time > one_year_ago:
-            url = f"{BASE}/lol/match/v5/matches/by-puuid/{puuid}/ids?startTime={one_year_ago}&endTime={last_match_start_time}&type=ranked&start=0&count=100&api_key={API_KEY}"
-            res = requests.get(url)
-            time.sleep(1)
-            assert res.status_code == 200, (
-                f"Request failed with status code {res.status_code}"
-            )
-            last_batch = res.json()
-            if not last_batch:
-                break
-
-            match_ids += last_batch
-            last_match_start_time = (
-                get_match_data(match_id=last_batch[-1])["info"]["gameStartTimestamp"]
-                // 1000
-            )
+        match_ids += batch
+        start += len(batch)
 
     return match_ids
 
 
-# Get match_data
-def get_match_data(match_id: str) -> dict:
-    url = f"{BASE}/lol/match/v5/matches/{match_id}?api_key={API_KEY}"
-    res = requests.get(url)
-    time.sleep(1)
-    assert res.status_code == 200, f"Request failed with status code {res.status_code}"
-    match_data = res.json()
-    return match_data
+# Read match_data from the local cache, if present
+def load_cached_match_data(match_id: str) -> dict | None:
+    path = CACHE_DIR / f"{match_id}.json"
+    if not path.exists():
+        return None
+    with open(path, "rb") as f:
+        try:
+            return orjson.loads(f.read())
+        except orjson.JSONDecodeError:
+            pass
+
+    # Corrupt entries are treated as a miss and refetched
+    path.unlink()
+    return None
+
+
+# Write match_data to the local cache
+def save_cached_match_data(match_id: str, match_data: dict):
+    CACHE_DIR.mkdir(exist_ok=True)
+    # Write to a temp file and swap it in so a partial write never lands in the cache
+    with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".tmp", delete=False) as f:
+        f.write(orjson.dumps(match_data))
+    os.replace(f.name, CACHE_DIR / f"{match_id}.json")
+
+
+# Seconds to wait before a retry, honouring Retry-After in seconds or HTTP-date form
+def get_retry_delay(retry_after: str | None, attempt: int) -> float:
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+        except (TypeError, ValueError):
+            pass
+    return 2**attempt
+
+
+# Get match_data asynchronously, bounded by a shared semaphore
+async def fetch_match_data(
+    session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, match_id: str
+) -> dict:
+    match_data = load_cached_match_data(match_id)
+    if match_data is not None:
+        return match_data
+
+    url = f"{BASE}/lol/match/v5/matches/{match_id}"
+    async with semaphore:
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with RATE_LIMIT_PER_SECOND, RATE_LIMIT_PER_TWO_MINUTES:
+                    async with session.get(url) as res:
+                        if (
+                            res.status not in RETRY_STATUS_CODES
+                            or attempt == MAX_RETRIES
+                        ):
+                            res.raise_for_status()
+                            match_data = orjson.loads(await res.read())
+                            save_cached_match_data(match_id, match_data)
+                            return match_data
+                        # Back off, preferring the server's Retry-After
+                        delay = get_retry_delay(res.headers.get("Retry-After"), attempt)
+            # Connection and read failures are retried like transient statuses
+            except (
+                aiohttp.ClientConnectionError,
+                aiohttp.ClientPayloadError,
+                TimeoutError,
+            ):
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = get_retry_delay(None, attempt)
+            await asyncio.sleep(delay)
+
+
+# Fetch match_data for all match IDs concurrently, preserving order
+async def fetch_all_match_data(match_ids: list[str]) -> list[dict]:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    connector = aiohttp.TCPConnector(limit_per_host=MAX_CONCURRENT_REQUESTS)
+    async with aiohttp.ClientSession(
+        connector=connector, headers={"X-Riot-Token": API_KEY}
+    ) as session:
+        tasks = [
+            fetch_match_data(session, semaphore, match_id) for match_id in match_ids
+        ]
+        return await asyncio.gather(*tasks)
+
+
+# Formats a millisecond epoch timestamp as local time
+def format_timestamp(timestamp: int) -> str:
+    return (
+        datetime.fromtimestamp(timestamp / 1000)
+        .astimezone()
+        .strftime("%Y-%m-%d %H:%M:%S %Z")
+    )
 
 
-# Formats raw match data into a structured summary
-def format_match_data(match_data: dict) -> dict:
-    metadata, info = match_data["metadata"], match_data["info"]
-    patch = ".".join(info["gameVersion"].split(".")[:2])
+# Extracts only the fields needed for aggregation for the given puuid
+def extract_stats(match_data: dict, puuid: str) -> dict:
+    info = match_data["info"]
 
-    formatted_match_data = {
-        "match_id": metadata["matchId"],
-        "start_time": datetime.fromtimestamp(info["gameStartTimestamp"] / 1000)
-        .astimezone()
-        .strftime("%Y-%m-%d %H:%M:%S %Z"),
-        "duration": info["gameDuration"] // 60,
-        "patch": patch,
-        "wining_team": 0 if info["teams"][0]["win"] else 1,
-        "teams": [[], []],
-    }
-
-    # Loop through all teammates
+    # Single pass: keep this puuid's row and accumulate totals for both teams
+    team_totals = [
+        {
+            "gold": 0,
+            "damage_dealt_to_champions": 0,
+            "damage_taken": 0,
+            "vision_score": 0,
+            "kills": 0,
+        }
+        for _ in range(2)
+    ]
     for p in info["participants"]:
-        # Name fallback if not present
-        if "riotIdGameName" not in p or "riotIdTagline" not in p:
-            summoner_name = get_summoner_name(puuid=p["puuid"])
-        else:
-            summoner_name = p["riotIdGameName"] + "#" + p["riotIdTagline"]
-
-        summoner = {
-            "puuid": p["puuid"],
-            "name": summoner_name,
-            "level": p["summonerLevel"],
-            "champion": {
-                "id": p["championId"],
-                "name": get_champion_name(p["championId"], patch),
-                "position": "support"
-                if p["teamPosition"].lower() == "utility"
-                else p["teamPosition"].lower(),
-                "level": p["champLevel"],
+        team = 0 if p["teamId"] == 100 else 1
+        if p["puuid"] == puuid:
+            puuid_team = team
+            champion = {
+                "name": get_champion_name(p["championId"]),
                 "kills": p["kills"],
                 "deaths": p["deaths"],
                 "assists": p["assists"],
                 "gold": p["goldEarned"],
                 "cs": p["totalMinionsKilled"] + p["neutralMinionsKilled"],
                 "vision_score": p["visionScore"],
-                "crowd_control_score": p["timeCCingOthers"],
-                "damage_dealt": p["totalDamageDealt"],
                 "damage_dealt_to_champions": p["totalDamageDealtToChampions"],
                 "damage_taken": p["totalDamageTaken"],
-            },
-        }
-
-        team = 0 if p["teamId"] == 100 else 1
+            }
 
-        formatted_match_data["teams"][team].append(summoner)
+        totals = team_totals[team]
+        totals["gold"] += p["goldEarned"]
+        totals["damage_dealt_to_champions"] += p["totalDamageDealtToChampions"]
+        totals["damage_taken"] += p["totalDamageTaken"]
+        totals["vision_score"] += p["visionScore"]
+        totals["kills"] += p["kills"]
 
-    return formatted_match_data
+    return {
+        "start_time": info["gameStartTimestamp"],
+        "duration": info["gameDuration"] // 60,
+        "wining_team": 0 if info["teams"][0]["win"] else 1,
+        "team": puuid_team,
+        "champion": champion,
+        "team_totals": team_totals[puuid_team],
+    }
 
 
 # Aggregates champion performance stats for given matches
-def get_match_stats(puuid: str, match_ids: list[str]) -> dict:
-    tmp: defaultdict[str, dict[str, Any]] = defaultdict(
-        lambda: {
-            "wins": 0,
-            "matches": 0,
-            "kills": 0,
-            "deaths": 0,
-            "assists": 0,
-            "cs": 0,
-            "gold_share": [],
-            "damage_dealt_to_champions_share": [],
-            "damage_taken_share": [],
-            "vision_score_share": [],
-            "kill_participation": [],
-        }
-    )
+def get_match_stats(
+    puuid: str, match_ids: list[str], summoner_name: str, summoner_rank: str
+) -> dict:
+    # Per-match stats stored as parallel columns, one element per valid match
+    champion_index: dict[str, int] = {}
+    champion_ids = array("q")
+    columns = {
+        key: array("d")
+        for key in (
+            "win",
+            "kills",
+            "deaths",
+            "assists",
+            "cs",
+            "gold",
+            "team_gold",
+            "damage_dealt_to_champions",
+            "team_damage_dealt_to_champions",
+            "damage_taken",
+            "team_damage_taken",
+            "vision_score",
+            "team_vision_score",
+            "kills_and_assists",
+            "team_kills",
+        )
+    }
 
     valid_matches = 0
     print(f"Processing {len(match_ids)} matchs")
 
+    # Prefetch every match before aggregating
+    matches = asyncio.run(fetch_all_match_data(match_ids))
+
     # Loop through each match
-    for i, match_id in enumerate(match_ids):
-        match_data = get_match_data(match_id)
-        match_data = format_match_data(match_data)
+    for i, (match_id, match_data) in enumerate(zip(match_ids, matches)):
+        match_data = extract_stats(match_data, puuid)
 
         if i == 0:
-            end_time = match_data["start_time"]
+            end_time = format_timestamp(match_data["start_time"])
 
         if i == len(match_ids) - 1:
-            start_time = match_data["start_time"]
+            start_time = format_timestamp(match_data["start_time"])
 
         # Skips matches resulted in early surrender
         if match_data["duration"] <= 5:
             continue
 
-        # Find which team this puuid belongs to
-        for team_id in range(2):
-            for summoner in match_data["teams"][team_id]:
-                if summoner["puuid"] == puuid:
-                    puuid_team = team_id
-
         # Team totals for share calculation
-        team_gold = 0
-        team_damage_dealt_to_champions = 0
-        team_damage_taken = 0
-        team_vision_score = 0
-        team_kills = 0
-
-        for summoner in match_data["teams"][puuid_team]:
-            team_gold += summoner["champion"]["gold"]
-            team_damage_dealt_to_champions += summoner["champion"][
-                "damage_dealt_to_champions"
-            ]
-            team_damage_taken += summoner["champion"]["damage_taken"]
-            team_vision_score += summoner["champion"]["vision_score"]
-            team_kills += summoner["champion"]["kills"]
+        team_totals = match_data["team_totals"]
 
         # Skips matches resulted in early surrender
         if (
-            team_damage_dealt_to_champions == 0
-            or team_damage_taken == 0
-            or team_vision_score == 0
-            or team_kills == 0
+            team_totals["damage_dealt_to_champions"] == 0
+            or team_totals["damage_taken"] == 0
+            or team_totals["vision_score"] == 0
+            or team_totals["kills"] == 0
         ):
             print(f"Skipping match {i}: {match_id} - {match_data['start_time']}")
             continue
@@ -263,82 +356,90 @@ def get_match_stats(puuid: str, match_ids: list[str]) -> dict:
         valid_matches += 1
 
         # collect this ppuid's champion stats
-        for summoner in match_data["teams"][puuid_team]:
-            if summoner["puuid"] == puuid:
-                champion_name = summoner["champion"]["name"]
-
-                # Check if this PUUID is on the winning team
-                if puuid_team == match_data["wining_team"]:
-                    tmp[champion_name]["wins"] += 1
-
-                tmp[champion_name]["matches"] += 1
-                tmp[champion_name]["kills"] += summoner["champion"]["kills"]
-                tmp[champion_name]["deaths"] += summoner["champion"]["deaths"]
-                tmp[champion_name]["assists"] += summoner["champion"]["assists"]
-                tmp[champion_name]["cs"] += summoner["champion"]["cs"]
-                tmp[champion_name]["gold_share"].append(
-                    summoner["champion"]["gold"] / team_gold
-                )
-                tmp[champion_name]["damage_dealt_to_champions_share"].append(
-                    summoner["champion"]["damage_dealt_to_champions"]
-                    / team_damage_dealt_to_champions
-                )
-                tmp[champion_name]["damage_taken_share"].append(
-                    summoner["champion"]["damage_taken"] / team_damage_taken
-                )
-                tmp[champion_name]["vision_score_share"].append(
-                    summoner["champion"]["vision_score"] / team_vision_score
-                )
-                tmp[champion_name]["kill_participation"].append(
-                    (summoner["champion"]["kills"] + summoner["champion"]["assists"])
-                    / team_kills
-                )
+        champion = match_data["champion"]
+        champion_name = champion["name"]
+
+        champion_ids.append(
+            champion_index.setdefault(champion_name, len(champion_index))
+        )
+        # Check if this PUUID is on the winning team
+        columns["win"].append(match_data["team"] == match_data["wining_team"])
+        columns["kills"].append(champion["kills"])
+        columns["deaths"].append(champion["deaths"])
+        columns["assists"].append(champion["assists"])
+        columns["cs"].append(champion["cs"])
+        columns["gold"].append(champion["gold"])
+        columns["team_gold"].append(team_totals["gold"])
+        columns["damage_dealt_to_champions"].append(
+            champion["damage_dealt_to_champions"]
+        )
+        columns["team_damage_dealt_to_champions"].append(
+            team_totals["damage_dealt_to_champions"]
+        )
+        columns["damage_taken"].append(champion["damage_taken"])
+        columns["team_damage_taken"].append(team_totals["damage_taken"])
+        columns["vision_score"].append(champion["vision_score"])
+        columns["team_vision_score"].append(team_totals["vision_score"])
+        columns["kills_and_assists"].append(champion["kills"] + champion["assists"])
+        columns["team_kills"].append(team_totals["kills"])
 
     # Format output
     match_stats = defaultdict(dict)
 
     match_stats["metadata"] = {
-        "name": get_summoner_name(puuid),
-        "rank": get_summoner_rank(puuid),
+        "name": summoner_name,
+        "rank": summoner_rank,
         "start_time": start_time,
         "end_time": end_time,
-        "unique_champions": len(tmp.keys()),
+        "unique_champions": len(champion_index),
         "matches": valid_matches,
     }
 
-    for key in tmp:
-        match_stats["champions"][key] = {
-            "wins": tmp[key]["wins"],
-            "matches": tmp[key]["matches"],
-            "win_rate": round(tmp[key]["wins"] / tmp[key]["matches"], 2),
-            "avg_kills": round(tmp[key]["kills"] / tmp[key]["matches"], 2),
-            "avg_deaths": round(tmp[key]["deaths"] / tmp[key]["matches"], 2),
-            "avg_assists": round(tmp[key]["assists"] / tmp[key]["matches"], 2),
-            "avg_cs": round(tmp[key]["cs"] / tmp[key]["matches"], 2),
-            "avg_gold_share": round(
-                sum(tmp[key]["gold_share"]) / len(tmp[key]["gold_share"]), 2
-            ),
-            "avg_damage_dealt_to_champions_share": round(
-                sum(tmp[key]["damage_dealt_to_champions_share"])
-                / len(tmp[key]["damage_dealt_to_champions_share"]),
-                2,
-            ),
-            "avg_damage_taken_share": round(
-                sum(tmp[key]["damage_taken_share"])
-                / len(tmp[key]["damage_taken_share"]),
-                2,
-            ),
-            "avg_vision_score_share": round(
-                sum(tmp[key]["vision_score_share"])
-                / len(tmp[key]["vision_score_share"]),
-                2,
-            ),
-            "avg_kill_participation": round(
-                sum(tmp[key]["kill_participation"])
-                / len(tmp[key]["kill_participation"]),
-                2,
-            ),
-        }
+    if champion_index:
+        col = {key: np.frombuffer(values) for key, values in columns.items()}
+        stats = np.column_stack(
+            (
+                col["win"],
+                col["kills"],
+                col["deaths"],
+                col["assists"],
+                col["cs"],
+                col["gold"] / col["team_gold"],
+                col["damage_dealt_to_champions"]
+                / col["team_damage_dealt_to_champions"],
+                col["damage_taken"] / col["team_damage_taken"],
+                col["vision_score"] / col["team_vision_score"],
+                col["kills_and_assists"] / col["team_kills"],
+            )
+        )
+
+        # Sum each champion's rows, grouping matches by champion index
+        ids = np.frombuffer(champion_ids, dtype=np.int64)
+        order = np.argsort(ids, kind="stable")
+        starts = np.searchsorted(ids[order], np.arange(len(champion_index)))
+        totals = np.add.reduceat(stats[order], starts, axis=0)
+        champion_matches = np.bincount(ids, minlength=len(champion_index))
+        # Python's round() matches the original sum/len averages; ndarray.round can differ
+        averages = [
+            [round(value, 2) for value in row]
+            for row in (totals / champion_matches[:, None]).tolist()
+        ]
+
+        for i, key in enumerate(champion_index):
+            match_stats["champions"][key] = {
+                "wins": int(totals[i, 0]),
+                "matches": int(champion_matches[i]),
+                "win_rate": averages[i][0],
+                "avg_kills": averages[i][1],
+                "avg_deaths": averages[i][2],
+                "avg_assists": averages[i][3],
+                "avg_cs": averages[i][4],
+                "avg_gold_share": averages[i][5],
+                "avg_damage_dealt_to_champions_share": averages[i][6],
+                "avg_damage_taken_share": averages[i][7],
+                "avg_vision_score_share": averages[i][8],
+                "avg_kill_participation": averages[i][9],
+            }
 
     # Sort by matches played and wins
     match_stats["champions"] = dict(
@@ -353,14 +454,25 @@ def get_match_stats(puuid: str, match_ids: list[str]) -> dict:
 
 # Save match stats
 def save_to_json(data: dict):
-    with open("output.json", "w") as f:
-        json.dump(data, f)
+    with open("output.json", "wb") as f:
+        # Stats are plain Python values; the NumPy option is only a safeguard
+        f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
 
 
 def analyze_player_match_history(name: str, tag: str):
-    puuid = get_puuid(name=name, tag=tag)
-    match_ids = get_match_ids(puuid)
-    result = get_match_stats(puuid, match_ids)
+    # Run the independent startup lookups concurrently on the shared session
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # Warms the cached champion data used by get_champion_name
+        champions_future = executor.submit(get_champion_data)
+        puuid = get_puuid(name=name, tag=tag)
+        name_future = executor.submit(get_summoner_name, puuid)
+        rank_future = executor.submit(get_summoner_rank, puuid)
+        match_ids = get_match_ids(puuid)
+        champions_future.result()
+        summoner_name = name_future.result()
+        summoner_rank = rank_future.result()
+
+    result = get_match_stats(puuid, match_ids, summoner_name, summoner_rank)
     save_to_json(result)
 
 